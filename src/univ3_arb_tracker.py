@@ -2,23 +2,131 @@
 LindenShore Technical Assessment - Uniswap v3 Liquidity Imbalance and Arbitrage Tracker
 
 This script samples two Uniswap v3 pools for the same pair but different fee tiers
-(ex: USDC/WETH 0.05% and 0.30%) via Ethereum JSON-RPC. The results are saved to a CSV file.
+(ex: USDC/WETH 0.05% and 0.30%) via Ethereum JSON-RPC. The results are saved to a Parquet (or CSV) file.
 
 Created By: Lucas Paschke
 """
 
 
+import csv
+import functools
 import json
+import math
 import time
+from collections.abc import Mapping
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from eth_abi import decode
+from eth_utils import get_abi_output_types
+from hexbytes import HexBytes
 from web3 import Web3
-from datetime import datetime, timedelta, timezone
-from decimal import Decimal, getcontext
+from datetime import datetime, timezone
+from decimal import Decimal, localcontext
 import os
 
+try:
+    import orjson
+except ImportError: # orjson is optional, stdlib json is used without it
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError: # numba is optional, the signal kernel then runs as plain Python/NumPy
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
 ## Initialization
-getcontext().prec = 40
+DECIMAL_PRECISION = 40 # digits, applied only inside the high_precision price paths
 ROOT = os.path.dirname(os.path.abspath(__file__))
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11" # same address on every EVM chain
+POOL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "univ3_arb")
+_Q96 = Decimal(1 << 96) # built from exact ints once instead of per call
+_Q192 = Decimal(1 << 192)
+LN_1_0001 = math.log1p(0.0001) # ln(1.0001); log1p avoids the rounding error of the float literal 1.0001
+TWAP_WINDOW_SECONDS = 300 # 5 minute TWAP, shared by the encoded observe() call and compute_twap()
+BATCH_RETRIES = 3 # JSON-RPC batches bypass web3's retry middleware, so make_batch_request() retries them itself
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504) # transient HTTP statuses worth retrying
+
+# Output columns in CSV order. Per-tick columns map to the dtype of their sample buffer,
+# the rest (None) are constant for the whole run and only broadcast when the file is written.
+OUTPUT_COLUMNS = {
+    "timestamp": np.int64, # Unix ms, converted to UTC datetimes only when the file is written
+    "poolA_address": None,
+    "poolB_address": None,
+    "symbol_pair": None,
+    "fee_a": None,
+    "fee_b": None,
+    "priceA_token1_per_token0": np.float64,
+    "priceB_token1_per_token0": np.float64,
+    "twapA_tick": np.float64,
+    "twapB_tick": np.float64,
+    "twap_deviation_a": np.float64,
+    "twap_deviation_b": np.float64,
+    "cross_pool_deviation": np.float64,
+    "liquidityA": object, # uint128, can overflow int64
+    "liquidityB": object,
+    "tickA": np.int64,
+    "tickB": np.int64
+}
+
+# Per-pool sample columns of OUTPUT_COLUMNS, in pool order (A then B)
+POOL_COLUMNS = (
+    {"price": "priceA_token1_per_token0", "twap": "twapA_tick", "twap_deviation": "twap_deviation_a",
+     "liquidity": "liquidityA", "tick": "tickA"},
+    {"price": "priceB_token1_per_token0", "twap": "twapB_tick", "twap_deviation": "twap_deviation_b",
+     "liquidity": "liquidityB", "tick": "tickB"}
+)
+
+# Signal columns summarized at the end of a run, in the order they are printed
+SIGNAL_COLUMNS = ("cross_pool_deviation",) + tuple(columns["twap_deviation"] for columns in POOL_COLUMNS)
+
+# Fixed Parquet schema for OUTPUT_COLUMNS. Liquidity is a uint128, so it is stored as a string to stay lossless.
+PARQUET_SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("ms", tz="UTC")),
+    ("poolA_address", pa.string()),
+    ("poolB_address", pa.string()),
+    ("symbol_pair", pa.string()),
+    ("fee_a", pa.float64()),
+    ("fee_b", pa.float64()),
+    ("priceA_token1_per_token0", pa.float64()),
+    ("priceB_token1_per_token0", pa.float64()),
+    ("twapA_tick", pa.float64()),
+    ("twapB_tick", pa.float64()),
+    ("twap_deviation_a", pa.float64()),
+    ("twap_deviation_b", pa.float64()),
+    ("cross_pool_deviation", pa.float64()),
+    ("liquidityA", pa.string()),
+    ("liquidityB", pa.string()),
+    ("tickA", pa.int64()),
+    ("tickB", pa.int64())
+])
+
+def json_loads(data):
+    """
+    Parses JSON from str or bytes, with orjson when it is installed (several times faster than stdlib json).
+    """
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def _json_default(obj):
+    if isinstance(obj, (bytes, bytearray)):
+        return "0x" + bytes(obj).hex()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_dumps(obj):
+    """
+    Serializes plain JSON types to UTF-8 bytes, with orjson when it is installed.
+    Bytes values (ex: HexBytes) are written as 0x-prefixed hex strings, like web3's own encoder does.
+    """
+    if orjson:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, default=_json_default).encode()
 
 def q_96():
     """Returns the Q96 fixed-point scaling factor (2**96).
@@ -30,7 +138,25 @@ def q_96():
         Decimal: The value 2**96 as a high-precision Decimal.
 
     """
-    return Decimal(2) ** 96
+    return _Q96
+
+@functools.lru_cache(maxsize=None)
+def price_scale(decimals_0, decimals_1, high_precision=False):
+    """
+    Returns the decimal adjustment 10 ** (decimals_0 - decimals_1) applied to raw Uniswap v3 prices.
+    Memoized since it only depends on the token pair.
+
+    Args:
+        decimals_0 (int): Decimal precision (ERC20) of the first token
+        decimals_1 (int): Decimal precision (ERC20) of the second token
+        high_precision (bool): Whether to return a Decimal instead of a float
+
+    Returns:
+        float: The scale factor (or a Decimal if high_precision is True)
+    """
+    if high_precision:
+        return Decimal(10) ** (decimals_0 - decimals_1)
+    return 10.0 ** (decimals_0 - decimals_1)
 
 
 
@@ -43,28 +169,107 @@ def load_config():
     """
     cfg = os.path.join(ROOT, 'config.json')
     if os.path.exists(cfg):
-        with open(cfg, 'r') as f:
-            return json.load(f)
-    with open(os.path.join(ROOT, 'config.example.json'), 'r') as f:
-        return json.load(f)
+        with open(cfg, 'rb') as f:
+            return json_loads(f.read())
+    with open(os.path.join(ROOT, 'config.example.json'), 'rb') as f:
+        return json_loads(f.read())
 
-def price_from_sqrt_price_x96(sqrt_price_x96, decimals_0, decimals_1, invert=False):
+def price_from_sqrt_price_x96(sqrt_price_x96, decimals_0, decimals_1, invert=False, high_precision=False):
     """
     Converts a Uniswap v3 'sqrt_price_x96' price  to an interpretable price.
+    By default the square is taken with exact Python ints and converted to float once at the end,
+    which is plenty of precision for monitoring and far cheaper than Decimal.
+    Called once per pool on every tick; for two pools this is faster than a NumPy version (array setup dominates).
     
     Args:
         sqrt_price_x96: The sqrt price from the Uniswap v3 pool.
         decimals_0: The decimal precision (ERC20) of the first token.
         decimals_1: The decimal precision (ERC20) of the second token.
         invert: Whether to invert the price (token 1 per token 0 or token 0 per token 1)
+        high_precision: Whether to compute the price as a 40-digit Decimal instead of a float
     Returns:
-        The interpretable price as a Decimal (ensures high precision).
+        The interpretable price as a float (or a Decimal if high_precision is True).
+    """
+
+    if high_precision:
+        with localcontext() as ctx:
+            ctx.prec = DECIMAL_PRECISION
+            ratio = (Decimal(sqrt_price_x96) ** 2) / _Q192 # Note _Q192 == q_96() ** 2
+            p1_per_p0 = ratio * price_scale(decimals_0, decimals_1, high_precision=True) # token 1 per token 0
+            return (Decimal(1) / p1_per_p0) if invert else p1_per_p0 # token 0 per token 1 if invert is True
+
+    ratio = (sqrt_price_x96 * sqrt_price_x96) / (1 << 192) # exact int square, single float division
+    p1_per_p0 = ratio * price_scale(decimals_0, decimals_1) # token 1 per token 0
+    return (1.0 / p1_per_p0) if invert else p1_per_p0 # token 0 per token 1 if invert is True
+
+class PooledHTTPProvider(Web3.HTTPProvider):
+    """
+    HTTP provider that sends every request through one keep-alive `requests.Session` with an explicit
+    connection pool, so calls reuse open connections instead of re-handshaking. make_request() posts through
+    that session from any thread (web3's own session cache is per thread, so concurrent_eth_call() workers
+    would otherwise each open their own connections).
+    The session is also used by batch_eth_call() to post JSON-RPC batches.
+    Requests and responses are (de)serialized with json_dumps()/json_loads(), so orjson is used when installed.
+
+    Retries are left to web3's built-in http_retry_request_middleware, so the adapter doesn't add a second
+    retry layer underneath it (which would multiply the worst-case latency of a stalled call).
+
+    Args:
+        endpoint_uri (str): The HTTP RPC URL of the Ethereum endpoint
+        request_kwargs (dict): Extra keyword arguments for each request (ex: timeout)
+        pool_maxsize (int): Maximum number of open connections (enough for every concurrent call of a tick)
     """
 
-    ratio = (Decimal(sqrt_price_x96) ** 2) / (q_96() ** 2) # Note Decimal(2) ** 96 == q_96()
-    scale = Decimal(10) ** (decimals_0 - decimals_1)
-    p1_per_p0 = ratio * scale # token 1 per token 0
-    return (Decimal(1) / p1_per_p0) if invert else p1_per_p0 # token 0 per token 1 if invert is True
+    def __init__(self, endpoint_uri, request_kwargs=None, pool_maxsize=8):
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+        super().__init__(endpoint_uri, request_kwargs)
+
+    def encode_rpc_request(self, method, params):
+        rpc_dict = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(self.request_counter)
+        }
+        return json_dumps(rpc_dict)
+
+    def decode_rpc_response(self, raw_response):
+        return json_loads(raw_response)
+
+    def make_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        response = self.session.post(self.endpoint_uri, data=request_data, **self.get_request_kwargs())
+        response.raise_for_status()
+        return self.decode_rpc_response(response.content)
+
+    def make_batch_request(self, payload, retries=BATCH_RETRIES, backoff_seconds=0.2):
+        """
+        Posts a JSON-RPC batch through the pooled session. Batches don't go through web3's middlewares, so
+        transient failures (connection errors, timeouts, 408/429/5xx) are retried here with exponential backoff.
+
+        Args:
+            payload (list): JSON-RPC request objects
+            retries (int): Maximum number of retries after the first attempt
+            backoff_seconds (float): Delay before the first retry, doubled on each following one
+
+        Returns:
+            requests.Response: The last response (status codes outside RETRY_STATUS_CODES are returned as is)
+        """
+        request_data = json_dumps(payload)
+        for attempt in range(retries + 1):
+            try:
+                response = self.session.post(self.endpoint_uri, data=request_data, **self.get_request_kwargs())
+                if response.status_code not in RETRY_STATUS_CODES:
+                    return response
+                response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError):
+                if attempt == retries:
+                    raise
+            time.sleep(backoff_seconds * 2 ** attempt)
 
 def connect_web3_client(rpc_url):
     """
@@ -75,34 +280,292 @@ def connect_web3_client(rpc_url):
         web.Web3: A Web3 client object if the connection is successful, otherwise None.
     """
     try:
-        return Web3(Web3.HTTPProvider(rpc_url, request_kwargs={'timeout': 10}))
+        w3 = Web3(PooledHTTPProvider(rpc_url, request_kwargs={'timeout': 10}))
+        # The validation middleware fetches eth_chainId before every eth_call to check a chainId field our
+        # read-only calls never set, doubling the round-trips of each tick
+        w3.middleware_onion.remove('validation')
+        return w3
     except Exception as e:
         print(f"Error connecting to Web3 client: {e}")
         return None
 
+@functools.lru_cache(maxsize=None)
 def load_abi(name):
     """
     Small helper to load a contract ABI JSON by logical name from `src/abi/` directory.
+    Memoized, so each ABI file is parsed once no matter how many contracts are bound to it.
     Args:
         name: The name of the ABI file
     Returns:
         dict: The ABI as a dictionary compatible with web3.eth.contract
     """
 
-    with open(os.path.join(ROOT, 'abi', f'{name}.json'), 'r') as f:
-        return json.load(f)
+    with open(os.path.join(ROOT, 'abi', f'{name}.json'), 'rb') as f:
+        return json_loads(f.read())
+
+@functools.lru_cache(maxsize=None)
+def checksum_address(address):
+    """
+    Memoized Web3.to_checksum_address, so each raw address string is normalized once.
+
+    Args:
+        address (str): Hex address in any casing
+
+    Returns:
+        str: The EIP-55 checksummed address
+    """
+    return Web3.to_checksum_address(address)
+
+@functools.lru_cache(maxsize=None)
+def has_multicall3(w3):
+    """
+    Checks once per client (eth_getCode) whether Multicall3 is deployed at MULTICALL3_ADDRESS on the connected chain.
+
+    Args:
+        w3 (web3.Web3): A connected Web3 client object.
+
+    Returns:
+        bool: True if there is contract code at MULTICALL3_ADDRESS
+    """
+    return len(w3.eth.get_code(MULTICALL3_ADDRESS)) > 0
+
+class UnsupportedReadError(Exception):
+    """
+    Raised when the endpoint can't serve a read strategy at all (ex: JSON-RPC batches rejected). Only this error makes the tracker fall back to a slower reader; transient
+    transport errors (timeouts, rate limits, 5xx) are left to the provider's retries and re-raised.
+    """
+
+def encode_call(fn):
+    """
+    Encodes a bound contract function call into a raw `eth_call` request so it can be sent in a batch.
+
+    Args:
+        fn (ContractFunction): A bound contract function with its arguments (ex: pool.functions.slot0())
+
+    Returns:
+        dict: {"to": <address>, "data": <calldata hex>, "output_types": <list of ABI output types>}
+    """
+    return {
+        "to": fn.address,
+        "data": fn._encode_transaction_data(),
+        "output_types": get_abi_output_types(fn.abi)
+    }
+
+def decode_call_output(call, raw):
+    """
+    Decodes the raw bytes returned by an `eth_call` using the output types stored by encode_call().
+
+    Args:
+        call (dict): An encoded call from encode_call()
+        raw (bytes): Raw return data of the call
+
+    Returns:
+        The decoded output. Single-output functions are unwrapped (ex: liquidity() returns an int rather than a 1-tuple).
+    """
+    decoded = decode(call["output_types"], raw)
+    return decoded[0] if len(decoded) == 1 else decoded
+
+def encode_multicall(multicall, calls):
+    """
+    Wraps several encoded calls into one Multicall3 `aggregate3` call. Failures are not allowed,
+    so a revert in any inner call reverts the whole aggregate.
+
+    Args:
+        multicall (Contract): Bound Multicall3 contract
+        calls (list): Encoded calls from encode_call()
+
+    Returns:
+        dict: The encoded aggregate3 call (see encode_call())
+    """
+    aggregate = [(call["to"], False, HexBytes(call["data"])) for call in calls]
+    return encode_call(multicall.functions.aggregate3(aggregate))
+
+def multicall_eth_call(w3, aggregate_call, calls, block_identifier):
+    """
+    Executes a pre-encoded Multicall3 `aggregate3` call as a single eth_call. Every inner call executes inside the
+    same on-chain call, so the results form one atomic snapshot of the block.
+
+    Args:
+        w3 (web3.Web3): A connected Web3 client object.
+        aggregate_call (dict): The aggregate call from encode_multicall()
+        calls (list): The encoded calls bundled in `aggregate_call`, used to decode each inner result
+        block_identifier (int | str): Block the aggregate call is executed against (ex: "latest")
+
+    Returns:
+        list: Decoded outputs in the same order as `calls` (see decode_call_output())
+
+    Raises:
+        ContractLogicError: If an inner call reverts (ex: observe() on a pool without enough observations).
+            Whether Multicall3 is deployed at all is checked up front with has_multicall3().
+    """
+    raw = w3.eth.call({"to": aggregate_call["to"], "data": aggregate_call["data"]}, block_identifier)
+    replies = decode_call_output(aggregate_call, raw)
+    return [decode_call_output(call, return_data) for call, (success, return_data) in zip(calls, replies)]
+
+def batch_eth_call(w3, calls, block_identifier):
+    """
+    Sends several `eth_call` requests as a single JSON-RPC batch (one HTTP POST over the provider's
+    keep-alive session, retried on transient errors, see PooledHTTPProvider.make_batch_request()) and decodes the results.
+    All calls are pinned to the same block so the returned state is consistent across pools.
+
+    Args:
+        w3 (web3.Web3): A Web3 client connected through PooledHTTPProvider.
+        calls (list): Encoded calls from encode_call()
+        block_identifier (int): Block number every call is executed against
+
+    Returns:
+        list: Decoded outputs in the same order as `calls` (see decode_call_output())
+
+    Raises:
+        UnsupportedReadError: If the endpoint refuses the batch or drops replies from it
+    """
+    block = hex(block_identifier)
+    payload = [
+        {"jsonrpc": "2.0", "id": i, "method": "eth_call", "params": [{"to": call["to"], "data": call["data"]}, block]}
+        for i, call in enumerate(calls)
+    ]
+    response = w3.provider.make_batch_request(payload)
+    if 400 <= response.status_code < 500:
+        raise UnsupportedReadError(f"Endpoint rejected JSON-RPC batch: HTTP {response.status_code}")
+    response.raise_for_status()
+    replies = json_loads(response.content)
+    if not isinstance(replies, list):
+        raise UnsupportedReadError(f"Endpoint rejected JSON-RPC batch: {replies}")
+
+    # Match replies to calls by id: endpoints may reorder them, drop some, or answer with an id-less error
+    replies_by_id = {reply.get("id"): reply for reply in replies if isinstance(reply, dict)}
+    missing = [i for i in range(len(calls)) if i not in replies_by_id]
+    if missing:
+        raise UnsupportedReadError(f"JSON-RPC batch returned {len(replies)} replies for {len(calls)} calls (missing ids {missing}): {replies}")
+
+    results = []
+    for i, call in enumerate(calls):
+        reply = replies_by_id[i]
+        if "error" in reply:
+            raise Exception(f"eth_call to {call['to']} failed: {reply['error']}")
+        results.append(decode_call_output(call, HexBytes(reply["result"])))
+    return results
+
+def concurrent_eth_call(w3, calls, block_identifier, executor=None):
+    """
+    Fallback for endpoints that do not accept JSON-RPC batches: issues every `eth_call` concurrently
+    from a thread pool so the round-trips overlap instead of running back to back.
+
+    Args:
+        w3 (web3.Web3): A connected Web3 client object.
+        calls (list): Encoded calls from encode_call()
+        block_identifier (int): Block number every call is executed against
+        executor (ThreadPoolExecutor): Thread pool reused across calls (the sampling loop creates one per run);
+            a temporary pool is used for one-off reads if omitted
+
+    Returns:
+        list: Decoded outputs in the same order as `calls` (see decode_call_output())
+    """
+    def eth_call(call):
+        raw = w3.eth.call({"to": call["to"], "data": call["data"]}, block_identifier)
+        return decode_call_output(call, raw)
+
+    if executor is None:
+        with ThreadPoolExecutor(max_workers=len(calls)) as executor:
+            return list(executor.map(eth_call, calls))
+    return list(executor.map(eth_call, calls))
+
+def read_calls(w3, readers, calls):
+    """
+    Reads `calls` with the first usable reader. A reader the endpoint can't serve (UnsupportedReadError)
+    is dropped from `readers` for the rest of the run; any other error is re-raised.
+    Readers that send separate eth_calls are pinned to the current block number (one extra round-trip) so
+    their results form a consistent snapshot; a multicall already runs every inner call against the same
+    state, so it reads "latest" directly.
+
+    Args:
+        w3 (web3.Web3): A connected Web3 client object.
+        readers (list): (name, reader, pin_block) tuples, fastest first. Modified in place when a reader is dropped.
+        calls (list): Encoded calls from encode_call()
+
+    Returns:
+        list: Decoded outputs in the same order as `calls` (see decode_call_output())
+    """
+    while True:
+        name, reader, pin_block = readers[0]
+        try:
+            return reader(w3, calls, w3.eth.block_number if pin_block else "latest")
+        except UnsupportedReadError as e:
+            if len(readers) == 1:
+                raise
+            print(f"{name} read unsupported ({e}), falling back to {readers[1][0]} reads")
+            readers.pop(0)
+
+def read_static_calls(w3, calls):
+    """
+    Reads calls that don't need a pinned block (ex: immutable metadata) in one Multicall3 round-trip,
+    falling back to concurrent calls if Multicall3 isn't deployed on the connected chain.
+
+    Args:
+        w3 (web3.Web3): A connected Web3 client object.
+        calls (list): Encoded calls from encode_call()
+
+    Returns:
+        list: Decoded outputs in the same order as `calls` (see decode_call_output())
+    """
+    if not has_multicall3(w3):
+        return concurrent_eth_call(w3, calls, "latest")
+    multicall = w3.eth.contract(address = MULTICALL3_ADDRESS, abi = load_abi('multicall3'))
+    return multicall_eth_call(w3, encode_multicall(multicall, calls), calls, "latest")
+
+def read_pool_metadata(w3, pool):
+    """
+    Reads the immutable metadata of a Uniswap v3 pool in two multicalls: the pool's tokens, fee and
+    tick spacing, then the symbol and decimals of both tokens.
+
+    Args:
+        w3 (web3.Web3): A connected Web3 client object.
+        pool (Contract): Bound Uniswap v3 Liquidity pool contract
+
+    Returns:
+        dict: {"token0": {"address", "symbol", "decimals"}, "token1": {...}, "fee": <fee>, "tick_spacing": <tick spacing>}
+    """
+    token0_address, token1_address, fee, tick_spacing = read_static_calls(w3, [
+        encode_call(pool.functions.token0()),
+        encode_call(pool.functions.token1()),
+        encode_call(pool.functions.fee()),
+        encode_call(pool.functions.tickSpacing())
+    ])
+
+    erc20 = load_abi('erc20')
+    token0 = w3.eth.contract(address = checksum_address(token0_address), abi = erc20)
+    token1 = w3.eth.contract(address = checksum_address(token1_address), abi = erc20)
+
+    symbol0, decimals0, symbol1, decimals1 = read_static_calls(w3, [
+        encode_call(token0.functions.symbol()),
+        encode_call(token0.functions.decimals()),
+        encode_call(token1.functions.symbol()),
+        encode_call(token1.functions.decimals())
+    ])
+
+    return {
+        "token0": {"address": token0.address, "symbol": symbol0, "decimals": decimals0},
+        "token1": {"address": token1.address, "symbol": symbol1, "decimals": decimals1},
+        "fee": fee,
+        "tick_spacing": tick_spacing
+    }
 
-def get_pool_view(w3, pool_address):
+def get_pool_view(w3, pool_address, chain_id):
     """
     Binds a Uniswap v3 liquidity pool and organizes essential metadata for run funciton.
     Specifically, this function will construct:
         1) A typed liquidity pool object using the Uniswap v3 Pool ABI
-        2) Token0 and Token1 contract objects using the ERC20 ABI to read symbol and decimals
+        2) Token0 and Token1 metadata (symbol and decimals, read with the ERC20 ABI)
         3) Liquidity pool metadata (address, fee, tick spacing, etc...)
 
+    The metadata never changes for a deployed pool, so it is cached in POOL_CACHE_DIR/<chain_id>/
+    (see read_pool_metadata()) and later runs need no RPC calls here. The same address can hold a
+    different contract on another chain, hence the chain_id key.
+
     Args:
         w3 (web3.Web3): A connected Web3 client object.
         pool_address: (string): Liquidity pool contract address, a hex string
+        chain_id (int): Chain id of the connected node, used to key the metadata cache
 
     Returns:
         dict: A dictionary containing the following metadata (keys):
@@ -111,6 +574,8 @@ def get_pool_view(w3, pool_address):
             3) 'token1' (dict): Token1 contract object in the form {"address": <address>, "symbol": <symbol>, "decimals": <decimals>}
             4) 'fee' (int): Liquidity pool fee
             5) 'tick_spacing' (int): Liquidity pool tick granularity
+            6) 'call_slot0', 'call_liquidity', 'call_observe' (dict): Pre-encoded slot0(), liquidity() and
+               observe([TWAP_WINDOW_SECONDS, 0]) calls (see encode_call()), so the sampling loop never re-encodes them
 
     Example usage:
         >>> w3 = Web3(Web3.HTTPProvider(w3, '0xA3b5E8C9F10D4726B09A1cE4d5F82e73B6A940C1')
@@ -119,75 +584,250 @@ def get_pool_view(w3, pool_address):
 
     """
 
-    pool = w3.eth.contract(address = Web3.to_checksum_address(pool_address), abi = load_abi('univ3_pool'))
-    
-    token0_address = pool.functions.token0().call()
-    token1_address = pool.functions.token1().call()
+    pool = w3.eth.contract(address = checksum_address(pool_address), abi = load_abi('univ3_pool'))
+
+    # Pool metadata is immutable, so it is read once and then served from the on-disk cache
+    cache_dir = os.path.join(POOL_CACHE_DIR, str(chain_id))
+    cache_path = os.path.join(cache_dir, f"{pool.address}.json")
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            metadata = json_loads(f.read())
+    else:
+        metadata = read_pool_metadata(w3, pool)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write to a temp file and swap it in, so an interrupted run never leaves a truncated cache entry
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json_dumps(metadata))
+        os.replace(tmp_path, cache_path)
 
-    erc20 = load_abi('erc20')
-
-    token0 = w3.eth.contract(address = token0_address, abi = erc20)
-    token1 = w3.eth.contract(address = token1_address, abi = erc20)
-
-    symbol0 = token0.functions.symbol().call()
-    symbol1 = token1.functions.symbol().call()
-    decimals0 = token0.functions.decimals().call()
-    decimals1 = token1.functions.decimals().call()
-    fee = pool.functions.fee().call()
-    tick_spacing = pool.functions.tickSpacing().call()
-    
     return {
         "pool": pool,
-        "token0": {"address": token0.address, "symbol": symbol0, "decimals": decimals0},
-        "token1": {"address": token1.address, "symbol": symbol1, "decimals": decimals1},
-        "fee": fee,
-        "tick_spacing": tick_spacing
+        "token0": metadata["token0"],
+        "token1": metadata["token1"],
+        "fee": metadata["fee"],
+        "tick_spacing": metadata["tick_spacing"],
+        "call_slot0": encode_call(pool.functions.slot0()),
+        "call_liquidity": encode_call(pool.functions.liquidity()),
+        "call_observe": encode_call(pool.functions.observe([TWAP_WINDOW_SECONDS, 0]))
     }
 
-def compute_twap(pool, window_seconds = 300):
+def compute_twap(tick_cumulatives, window_seconds = TWAP_WINDOW_SECONDS):
     """
     Computes a Time Weighted Average Price (TWAP) over a specified window.
-    Uses the Uniswap v3 Pool ABI's 'observe' function to fetch price and liquidity changes over time.
+    Uses the tickCumulatives returned by the Uniswap v3 Pool ABI's 'observe([window_seconds, 0])' call.
     Note: TWAP_tick = (tick_cumulative_now - tick_cumulative_then) - one window
+          Floor division matches Uniswap's OracleLibrary rounding for negative deltas.
 
     Args:
-        pool (Contract): Bound Uniswap v3 Liquidity pool contract
-        window_seconds (int): Lookback window in seconds (default: 300 or 5 mins)
+        tick_cumulatives (tuple): The (then, now) tickCumulatives from observe()
+        window_seconds (int): Lookback window in seconds (default: TWAP_WINDOW_SECONDS, 5 mins)
 
     Returns:
         int: The average tick over the window
 
     """
-    (ticks, seconds) = pool.functions.observe([window_seconds, 0]).call()
-    tick_start, tick_end = ticks[0], ticks[1]
-    twap = (tick_end - tick_start) // window_seconds
-    return int(twap)
+    tick_start, tick_end = tick_cumulatives
+    return (tick_end - tick_start) // window_seconds
 
-def tick_to_price(tick, decimals_0, decimals_1, invert=False):
+def tick_to_price(tick, decimals_0, decimals_1, invert=False, high_precision=False):
     """
     Converts a Uniswap v3 'tick' to an interpretable price.
 
     Important Note: In Uniswap v3, tick spacing is fixed at a constant ratio of 1.0001.
                     So, price = (1.0001 ** tick) * (10 ** (decimal_0 - decimal_1))
+    Called once per pool on every tick; for two pools this is faster than a NumPy version (array setup dominates).
 
     Args:
         tick (int): Tick index
         decimals_0 (int): Decimal precision (ERC20) of the first token
         decimals_1 (int): Decimal precision (ERC20) of the second token
         invert (bool): Whether to invert the price (token 1 per token 0 or token 0 per token 1)
+        high_precision (bool): Whether to compute the price as a 40-digit Decimal instead of a float
 
     Returns:
-        Decimal: The price corresponding to the tick, as a Decimal (ensures high precision)
+        float: The price corresponding to the tick (or a Decimal if high_precision is True)
     """
 
-    base = Decimal('1.0001') ** Decimal(tick)
-    scale = Decimal(10) ** (decimals_0 - decimals_1)
-    p1_per_p0 = base * scale
-    return (Decimal(1) / p1_per_p0) if invert else p1_per_p0
+    if high_precision:
+        with localcontext() as ctx:
+            ctx.prec = DECIMAL_PRECISION
+            base = Decimal('1.0001') ** Decimal(tick)
+            p1_per_p0 = base * price_scale(decimals_0, decimals_1, high_precision=True)
+            return (Decimal(1) / p1_per_p0) if invert else p1_per_p0
+
+    p1_per_p0 = math.exp(tick * LN_1_0001) * price_scale(decimals_0, decimals_1) # double precision
+    return (1.0 / p1_per_p0) if invert else p1_per_p0
+
+def allocate_buffers(capacity):
+    """
+    Allocates one fixed-capacity column array per sampled field (structure of arrays), so the
+    sampling loop writes into preallocated slots instead of building a dict per row.
+
+    Args:
+        capacity (int): Number of samples each buffer can hold
+
+    Returns:
+        dict: {column name: np.ndarray} for every per-tick column of OUTPUT_COLUMNS
+    """
+    return {name: np.empty(capacity, dtype=dtype) for name, dtype in OUTPUT_COLUMNS.items() if dtype is not None}
+
+def buffers_to_frame(buffers, n_samples, constants):
+    """
+    Builds a DataFrame in OUTPUT_COLUMNS order from the first `n_samples` of the sample buffers.
+
+    Args:
+        buffers (dict): Buffers from allocate_buffers()
+        n_samples (int): Number of filled samples
+        constants (dict): Values of the columns that are constant for the whole run
+
+    Returns:
+        pd.DataFrame: One row per sample, with timestamps converted to UTC datetimes
+    """
+    df = pd.DataFrame({
+        name: buffers[name][:n_samples] if dtype is not None else constants[name]
+        for name, dtype in OUTPUT_COLUMNS.items()
+    })
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit='ms', utc=True)
+    return df
+
+def resolve_output_format(output_path, output_format=None):
+    """
+    Determines the output format. Without OUTPUT_FORMAT it follows the OUTPUT_PATH suffix (.csv or .parquet),
+    so configs written before Parquet support keep producing CSV.
+
+    Args:
+        output_path (str): Path of the output file
+        output_format (str): Configured OUTPUT_FORMAT, if any
+
+    Returns:
+        str: 'parquet' or 'csv'
+
+    Raises:
+        ValueError: If the configured format is not 'parquet' or 'csv', or contradicts the path suffix
+    """
+    suffix = os.path.splitext(output_path)[1].lower().lstrip('.')
+    if output_format is None:
+        return "csv" if suffix == "csv" else "parquet"
+    if output_format not in ("parquet", "csv"):
+        raise ValueError(f"Unsupported OUTPUT_FORMAT: {output_format}")
+    if suffix in ("csv", "parquet") and suffix != output_format:
+        raise ValueError(f"OUTPUT_FORMAT '{output_format}' does not match OUTPUT_PATH {output_path}")
+    return output_format
+
+def open_writer(output_path, output_format):
+    """
+    Opens the output file for incremental writes. CSV output gets its header row right away.
+
+    Args:
+        output_path (str): Path of the output file
+        output_format (str): 'parquet' (default) or 'csv'
+
+    Returns:
+        dict: Writer state passed to write_row(), write_samples() and close_writer()
+    """
+    if output_format == "csv":
+        f = open(output_path, 'w', newline='')
+        rows = csv.writer(f)
+        rows.writerow(OUTPUT_COLUMNS)
+        return {"format": "csv", "file": f, "writer": rows}
+    if output_format == "parquet":
+        return {"format": "parquet", "writer": pq.ParquetWriter(output_path, PARQUET_SCHEMA)}
+    raise ValueError(f"Unsupported OUTPUT_FORMAT: {output_format}")
+
+def write_row(writer, buffers, i, constants):
+    """
+    Streams sample `i` of the buffers to a CSV output as one row, flushed immediately so a partial
+    run is still readable. Parquet output is written in chunks by write_samples() instead.
+
+    Args:
+        writer (dict): Writer state from open_writer()
+        buffers (dict): Buffers from allocate_buffers()
+        i (int): Index of the sample to write
+        constants (dict): Values of the columns that are constant for the whole run
+    """
+    if writer["format"] != "csv":
+        return
+    timestamp = datetime.fromtimestamp(buffers["timestamp"][i] / 1000, timezone.utc).isoformat(timespec='milliseconds')
+    writer["writer"].writerow(tuple(
+        timestamp if name == "timestamp" else buffers[name][i] if dtype is not None else constants[name]
+        for name, dtype in OUTPUT_COLUMNS.items()
+    ))
+    writer["file"].flush()
+
+def write_samples(writer, buffers, n_samples, constants):
+    """
+    Appends the first `n_samples` of the buffers to a Parquet output as one record batch.
+    CSV output is already streamed row by row by write_row().
+
+    Args:
+        writer (dict): Writer state from open_writer()
+        buffers (dict): Buffers from allocate_buffers()
+        n_samples (int): Number of filled samples
+        constants (dict): Values of the columns that are constant for the whole run
+    """
+    if writer["format"] != "parquet":
+        return
+    df = buffers_to_frame(buffers, n_samples, constants).astype({"liquidityA": str, "liquidityB": str})
+    writer["writer"].write_batch(pa.RecordBatch.from_pandas(df, schema=PARQUET_SCHEMA, preserve_index=False))
+
+def close_writer(writer):
+    """
+    Closes the output file (for Parquet, this writes the file footer).
+
+    Args:
+        writer (dict): Writer state from open_writer()
+    """
+    if writer["format"] == "csv":
+        writer["file"].close()
+    else:
+        writer["writer"].close()
+
+@njit(cache=True, fastmath=True)
+def compute_signals(price_a, price_b, twap_price_a, twap_price_b):
+    """
+    Computes the arbitrage and mean-reversion signals over arrays of samples, for replaying or backtesting a saved
+    output (ex: the four price columns of pd.read_parquet(OUTPUT_PATH)). It is not called while sampling: the loop
+    already stores each tick's signals, and a first-call JIT compile would stall a tick.
+    JIT-compiled with Numba when it is installed (compiled once and cached to disk across runs).
+
+    Args:
+        price_a (np.ndarray): float64 spot prices of pool A
+        price_b (np.ndarray): float64 spot prices of pool B
+        twap_price_a (np.ndarray): float64 TWAP prices of pool A
+        twap_price_b (np.ndarray): float64 TWAP prices of pool B
+
+    Returns:
+        tuple: (cross_pool_deviation, twap_deviation_a, twap_deviation_b) as float64 arrays of % deviations
+    """
+    n = price_a.shape[0]
+    cross_pool_deviation = np.empty(n)
+    twap_deviation_a = np.empty(n)
+    twap_deviation_b = np.empty(n)
+    for i in range(n):
+        cross_pool_deviation[i] = (price_a[i] - price_b[i]) / ((price_a[i] + price_b[i]) / 2) * 100
+        twap_deviation_a[i] = (price_a[i] - twap_price_a[i]) / twap_price_a[i] * 100
+        twap_deviation_b[i] = (price_b[i] - twap_price_b[i]) / twap_price_b[i] * 100
+    return cross_pool_deviation, twap_deviation_a, twap_deviation_b
+
+def update_signal_summary(summary, buffers, n_samples):
+    """
+    Folds the signal columns of the first `n_samples` of the buffers into the running signal summary (sample count
+    plus sum and max of |deviation| per signal), so the end-of-run summary never has to reload the output file.
+
+    Args:
+        summary (dict): Running summary {"count": int, "abs_sum": np.ndarray, "abs_max": np.ndarray}, updated in place
+        buffers (dict): Buffers from allocate_buffers()
+        n_samples (int): Number of filled samples
+    """
+    abs_signals = np.abs([buffers[name][:n_samples] for name in SIGNAL_COLUMNS])
+    summary["count"] += n_samples
+    summary["abs_sum"] += abs_signals.sum(axis=1)
+    summary["abs_max"] = np.maximum(summary["abs_max"], abs_signals.max(axis=1))
 
 def run():
     """
-    Main sampling and signal generation loop: connect Web3, query liquidity pools, find signals, and save results in CSV
+    Main sampling and signal generation loop: connect Web3, query liquidity pools, find signals, and save results in Parquet or CSV
 
     Workflow:
         1) Load configuration (RPC URL, pool addresses, cadence, duration, output path)
@@ -195,18 +835,22 @@ def run():
            but different fee tiers (ex: 0.05% and 0.30%)
         
         3) for each dame interval of SAMPLE_INTERVAL_SECONDS until RUN_DURATION_MINUTES, do the following:
+            - Read slot0, liquidity and observe for both pools in one Multicall3 aggregate3 call against the latest block
+              (falling back to a JSON-RPC batch, then to concurrent calls, if the endpoint rejects those)
             - Read spot state from each pool's slot0
-            - Compute 5 minute TWAP tick using observe([300, 0]) and convert to price using tick_to_price()
+            - Compute 5 minute TWAP tick from observe([TWAP_WINDOW_SECONDS, 0]) and convert to price
             - Compute signals:
                 * cross_pool_deviation: price gap across fee tiers (arbitrage cue)
                 * twap_deviation_a, twap_deviation_b: spot vs TWAP deviations (mean-reversion cue)
 
-            - Append a record with timestamp, prices, TWAPs, ticks, liquidity, and signals
+            - Write a record with timestamp, prices, TWAPs, ticks, liquidity, and signals into the column buffers
         
-        4) Save observations to CSV file at OUTPUT_PATH
+        4) Append observations to the Parquet file at OUTPUT_PATH every FLUSH_EVERY_SAMPLES ticks
+           (or stream them to the CSV file row by row if OUTPUT_FORMAT is 'csv')
+        5) Print a summary of the signals over the whole run (accumulated from the signal buffers as each chunk of samples is flushed)
 
     Output: 
-        CSV file at OUTPUT_PATH with columns:
+        Parquet file (or CSV file if OUTPUT_FORMAT is 'csv') at OUTPUT_PATH with columns:
 
         timestamp, poolA_address, poolB_address, symbol_pair, fee_a, fee_b,
         priceA_token1_per_token0, priceB_token1_per_token0, twapA_tick, twapB_tick,
@@ -218,8 +862,14 @@ def run():
     rpc = config["ETH_RPC"]
     pools = config["POOLS"]
     output_path = config["OUTPUT_PATH"]
+    output_format = resolve_output_format(output_path, config.get("OUTPUT_FORMAT"))
+    flush_every = int(config.get("FLUSH_EVERY_SAMPLES", 64))
     interval_seconds = int(config.get("SAMPLE_INTERVAL_SECONDS", 15))
     duration_minutes = int(config.get("RUN_DURATION_MINUTES", 5))
+    if interval_seconds < 0:
+        raise ValueError(f"SAMPLE_INTERVAL_SECONDS must be >= 0, got {interval_seconds}")
+    if flush_every < 1:
+        raise ValueError(f"FLUSH_EVERY_SAMPLES must be >= 1, got {flush_every}")
 
     # Connect to Web3
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -234,73 +884,115 @@ def run():
 
 
     # Two fee tiers per pair (0.05% and 0.30%)
-    view_a = get_pool_view(w3, pools["USDC_WETH_005"])
-    view_b = get_pool_view(w3, pools["USDC_WETH_03"])
-
-    rows = []
-    end_time = datetime.now(timezone.utc) + timedelta(minutes=duration_minutes)
-
-    # main loop
-    while datetime.now(timezone.utc) < end_time:
-        time_stamp = datetime.now(timezone.utc).isoformat()
-
-        # Pool 1 @ 0.05%
-        slot0_a = view_a["pool"].functions.slot0().call()
-        sqrt_price_x96_a = slot0_a[0]
-        tick_a = slot0_a[1]
-        liquidity_a = view_a["pool"].functions.liquidity().call()
-        price_a = price_from_sqrt_price_x96(sqrt_price_x96_a, view_a["token0"]["decimals"], view_a["token1"]["decimals"])
-        twap_a = compute_twap(view_a["pool"], window_seconds = 300)
-        twap_price_a = tick_to_price(twap_a, view_a["token0"]["decimals"], view_a["token1"]["decimals"])
-
-        # Pool 2 @ 0.30%
-        slot0_b = view_b["pool"].functions.slot0().call()
-        sqrt_price_x96_b = slot0_b[0]
-        tick_b = slot0_b[1]
-        liquidity_b = view_b["pool"].functions.liquidity().call()
-        price_b = price_from_sqrt_price_x96(sqrt_price_x96_b, view_b["token0"]["decimals"], view_b["token1"]["decimals"])
-        twap_b = compute_twap(view_b["pool"], window_seconds = 300)
-        twap_price_b = tick_to_price(twap_b, view_b["token0"]["decimals"], view_b["token1"]["decimals"])
-        
-        # Calculate signals
-        # % Diff between pools
-        cross_pool_deviation = (price_a - price_b) / ((price_a + price_b) / 2) * 100
-        twap_deviation_a = ((price_a - twap_price_a) / twap_price_a)* 100
-        twap_deviation_b = ((price_b - twap_price_b) / twap_price_b)* 100
-        
-        # Fill out rows
-        rows.append({
-            "timestamp": time_stamp,
-            "poolA_address": view_a["pool"].address,
-            "poolB_address": view_b["pool"].address,
-            "symbol_pair": f"{view_a['token0']['symbol']}/{view_a['token1']['symbol']}",
-            "fee_a": view_a["fee"] / 100,
-            "fee_b": view_b["fee"] / 100,
-            "priceA_token1_per_token0": str(price_a),
-            "priceB_token1_per_token0": str(price_b),
-            "twapA_tick": str(twap_price_a),
-            "twapB_tick": str(twap_price_b),
-            "twap_deviation_a": float(twap_deviation_a),
-            "twap_deviation_b": float(twap_deviation_b),
-            "cross_pool_deviation": float(cross_pool_deviation),
-            "liquidityA": int(liquidity_a),
-            "liquidityB": int(liquidity_b),
-            "tickA": tick_a,
-            "tickB": tick_b
-        })
-
-        print(f"Sampled at {time_stamp}\n")
-        print(f"Price A = {price_a:.6f}, Price B = {price_b:.6f}\n")
-        print(f"Cross Dev = {cross_pool_deviation:.4f}%\n") 
-        print(f"TWAP Dev A = {twap_deviation_a:.4f}%, TWAP Dev B = {twap_deviation_b:.4f}%")
-
-        time.sleep(interval_seconds)
-    
-    # Save to CSV
-    df = pd.DataFrame(rows)
-    df.to_csv(output_path, index=False)
+    view_a = get_pool_view(w3, pools["USDC_WETH_005"], chain_id)
+    view_b = get_pool_view(w3, pools["USDC_WETH_03"], chain_id)
+
+    views = (view_a, view_b) # in POOL_COLUMNS order
+
+    # The per-tick calls never change, so the list of pre-encoded calls is built once
+    calls = []
+    for view in views:
+        calls += [view["call_slot0"], view["call_liquidity"], view["call_observe"]]
+
+    # Per-tick readers, fastest first. They are probed once here; a reader the endpoint can't serve is dropped
+    # for the rest of the run, while transient errors are retried by the provider and otherwise re-raised.
+    multicall = w3.eth.contract(address = MULTICALL3_ADDRESS, abi = load_abi('multicall3'))
+    aggregate_call = encode_multicall(multicall, calls)
+    executor = ThreadPoolExecutor(max_workers=len(calls)) # created once, so the fallback doesn't respawn threads every tick
+    readers = [
+        ("multicall", lambda w3, calls, block: multicall_eth_call(w3, aggregate_call, calls, block), False),
+        ("batch", batch_eth_call, True),
+        ("concurrent", lambda w3, calls, block: concurrent_eth_call(w3, calls, block, executor), True)
+    ]
+    if not has_multicall3(w3):
+        print(f"No Multicall3 contract at {MULTICALL3_ADDRESS}, falling back to {readers[1][0]} reads")
+        readers.pop(0)
+    read_calls(w3, readers, calls)
+
+    # Columns that are constant for the whole run
+    constants = {
+        "poolA_address": view_a["pool"].address,
+        "poolB_address": view_b["pool"].address,
+        "symbol_pair": f"{view_a['token0']['symbol']}/{view_a['token1']['symbol']}",
+        "fee_a": view_a["fee"] / 100,
+        "fee_b": view_b["fee"] / 100
+    }
+
+    # Samples accumulate in fixed-size column buffers. CSV rows are streamed as each sample lands, Parquet
+    # batches are appended every `flush_every` ticks, so memory stays bounded and a crash or Ctrl-C
+    # keeps everything written so far
+    buffers = allocate_buffers(flush_every)
+    n_samples = 0
+    summary = {"count": 0, "abs_sum": np.zeros(3), "abs_max": np.zeros(3)}
+    writer = open_writer(output_path, output_format)
+    # Deadlines run on the monotonic clock so wall-clock adjustments can't stretch or cut the run
+    next_tick = time.monotonic()
+    end_time = next_tick + duration_minutes * 60
+
+    try:
+        # main loop
+        while next_tick < end_time:
+            now = datetime.now(timezone.utc)
+
+            # Read both pools as one consistent snapshot (a single round-trip with the multicall reader)
+            results = read_calls(w3, readers, calls)
+            slot0s, liquidities, observations = results[0::3], results[1::3], results[2::3]
+
+            # Spot and TWAP prices for every pool (token 1 per token 0)
+            prices, twap_prices = [], []
+            for view, slot0, observation in zip(views, slot0s, observations):
+                decimals0, decimals1 = view["token0"]["decimals"], view["token1"]["decimals"]
+                prices.append(price_from_sqrt_price_x96(slot0[0], decimals0, decimals1))
+                twap_prices.append(tick_to_price(compute_twap(observation[0]), decimals0, decimals1))
+
+            # Calculate signals
+            twap_deviations = [(price - twap_price) / twap_price * 100 for price, twap_price in zip(prices, twap_prices)]
+            # % Diff between pools
+            cross_pool_deviation = (prices[0] - prices[1]) / ((prices[0] + prices[1]) / 2) * 100
+
+            # Fill out the next sample slot
+            i = n_samples
+            buffers["timestamp"][i] = int(now.timestamp() * 1000)
+            buffers["cross_pool_deviation"][i] = cross_pool_deviation
+            for k, columns in enumerate(POOL_COLUMNS):
+                buffers[columns["price"]][i] = prices[k]
+                buffers[columns["twap"]][i] = twap_prices[k]
+                buffers[columns["twap_deviation"]][i] = twap_deviations[k]
+                buffers[columns["liquidity"]][i] = liquidities[k]
+                buffers[columns["tick"]][i] = slot0s[k][1]
+            write_row(writer, buffers, i, constants)
+            n_samples += 1
+            if n_samples == flush_every:
+                write_samples(writer, buffers, n_samples, constants)
+                update_signal_summary(summary, buffers, n_samples)
+                n_samples = 0
+
+            print(f"Sampled at {now}\n")
+            print(f"Price A = {prices[0]:.6f}, Price B = {prices[1]:.6f}\n")
+            print(f"Cross Dev = {cross_pool_deviation:.4f}%\n") 
+            print(f"TWAP Dev A = {twap_deviations[0]:.4f}%, TWAP Dev B = {twap_deviations[1]:.4f}%")
+
+            # Sleep until the next deadline instead of a fixed interval, so RPC latency doesn't shift the cadence.
+            # If the tick overran, skip the missed deadlines rather than sampling in a burst to catch up
+            next_tick += interval_seconds
+            behind = time.monotonic() - next_tick
+            if behind > 0:
+                # With a zero interval there are no deadlines to skip, samples just run back to back
+                next_tick += math.ceil(behind / interval_seconds) * interval_seconds if interval_seconds else behind
+            time.sleep(max(0, next_tick - time.monotonic()))
+    finally:
+        if n_samples:
+            write_samples(writer, buffers, n_samples, constants)
+            update_signal_summary(summary, buffers, n_samples)
+        close_writer(writer)
+        executor.shutdown()
     print(f"Successfully saved to {config['OUTPUT_PATH']}")
-        
+
+    # Summarize signals over the run from the running totals
+    if summary["count"]:
+        for name, abs_sum, abs_max in zip(("Cross Dev", "TWAP Dev A", "TWAP Dev B"), summary["abs_sum"], summary["abs_max"]):
+            print(f"{name}: mean |dev| = {abs_sum / summary['count']:.4f}%, max |dev| = {abs_max:.4f}%")
+
 
 ## Run the script!
 if __name__ == "__main__":